@@ -4,4 +4,4 @@ from .ovf2 import OVF2_FIRST_LINE, \
     BINARY4_FLAG, BINARY8_FLAG
 
 from .hdf5 import DETECT_OVF_EXTS, HEADER_TIME_KEY_CANDIDATES, \
-     DEFAULT_H5NAME, TIME_GROUPKEY, MAGNETIZATION_GROUPKEY
\ No newline at end of file
+     DEFAULT_H5NAME, TIME_GROUPKEY, MAGNETIZATION_GROUPKEY, FINGERPRINT_ATTRKEY
\ No newline at end of file
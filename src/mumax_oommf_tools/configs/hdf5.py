@@ -3,4 +3,5 @@ HEADER_TIME_KEY_CANDIDATES = ["Desc: Total simulation time",]
 
 DEFAULT_H5NAME = "mumax_oommf_tools.h5"
 TIME_GROUPKEY = "time"
-MAGNETIZATION_GROUPKEY = "magnetization"
\ No newline at end of file
+MAGNETIZATION_GROUPKEY = "magnetization"
+FINGERPRINT_ATTRKEY = "_fingerprint" # hash of the OVF fileset the container was built from
\ No newline at end of file
@@ -1,17 +1,33 @@
 import os
-import psutil
 from typing import Optional, Literal, Tuple
 
 import numpy as np
 import h5py
 
+try:
+    # importing hdf5plugin registers its filters with h5py, which is required
+    # to read caches built with compression="bitshuffle"
+    import hdf5plugin  # noqa: F401
+except ImportError:
+    pass
+
 from .hdf5_store import (
     build_h5_from_ovfs,
+    _collect_ovf_files,
+    _fingerprint_ovf_files,
     MAGNETIZATION_GROUPKEY,
     TIME_GROUPKEY,
     DEFAULT_H5NAME,
+    FINGERPRINT_ATTRKEY,
 )
 
+def _total_ram() -> Optional[int]:
+    """Total physical RAM in bytes, or None if the platform can't tell."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
 def _format_bytes(n: int) -> str:
     units = ["B", "KB", "MB", "GB", "TB"]
     f = float(n)
@@ -76,7 +92,20 @@ def read_simulation_result(
     if os.path.exists(h5_path) and overwrite_cache:
         os.remove(h5_path)
 
-    if not os.path.exists(h5_path):
+    # Fast skip: if the cache already covers exactly this OVF fileset
+    # (same paths, same mtimes), don't touch the OVFs at all
+    up_to_date = False
+    if os.path.exists(h5_path):
+        try:
+            fingerprint = _fingerprint_ovf_files(_collect_ovf_files(fdn))
+        except FileNotFoundError:
+            # raw OVFs were deleted after caching; the cache is all we have
+            up_to_date = True
+        else:
+            with h5py.File(h5_path, "r") as f:
+                up_to_date = f.attrs.get(FINGERPRINT_ATTRKEY) == fingerprint
+
+    if not up_to_date:
         build_h5_from_ovfs(
             fdn,
             h5_name=DEFAULT_H5NAME,
@@ -92,25 +121,33 @@ def read_simulation_result(
         mset = f[MAGNETIZATION_GROUPKEY]
         tset = f[TIME_GROUPKEY]
 
-        shape = tuple(mset.shape)  # (T,X,Y,Z,3)
+        shape = tuple(mset.shape)  # (T,Z,Y,X,3), natural OVF storage order
         dtype = mset.dtype
 
-        expected_shape = (len(tset), int(f.attrs['xnodes']), int(f.attrs['ynodes']), int(f.attrs['znodes']), 3)
+        expected_shape = (len(tset), int(f.attrs['znodes']), int(f.attrs['ynodes']), int(f.attrs['xnodes']), 3)
         if shape != expected_shape:
-            raise ValueError(f"Expected magnetization shape (T,X,Y,Z,3), got {shape}.")
+            raise ValueError(f"Expected magnetization shape (T,Z,Y,X,3), got {shape}.")
 
         needed = _nbytes(shape, dtype)
 
-        if psutil is not None:
-            total_ram = psutil.virtual_memory().total
-            if needed > total_ram:
-                raise MemoryError(
-                    f"Magnetization needs {_format_bytes(needed)} but system RAM is "
-                    f"{_format_bytes(int(total_ram))}."
-                )
+        total_ram = _total_ram()
+        if total_ram is not None and needed > total_ram:
+            raise MemoryError(
+                f"Magnetization needs {_format_bytes(needed)} but system RAM is "
+                f"{_format_bytes(int(total_ram))}."
+            )
 
         metadata = _read_metadata(f.attrs)
-        time = tset[...].astype(np.float64, copy=False)
-        magnetization = mset[...]
+
+        # read into caller-owned buffers; slicing (tset[...], mset[...]) would
+        # allocate an internal temporary on top of the returned array, doubling
+        # peak RSS for large datasets
+        time = np.empty(len(tset), dtype=np.float64)
+        tset.read_direct(time)
+
+        magnetization = np.empty(shape, dtype=dtype)
+        mset.read_direct(magnetization)
+        # stored natural (T,Z,Y,X,3); expose the documented (T,X,Y,Z,3) view
+        magnetization = magnetization.transpose(0, 3, 2, 1, 4)
 
     return metadata, time, magnetization
\ No newline at end of file
@@ -1,28 +1,119 @@
+import io
+import os
+import re
+import mmap
+import struct
+
 import numpy as np
 
+try:
+    import pandas as pd  # optional: fast C tokenizer for Text-mode payloads
+except ImportError:
+    pd = None
+
+try:
+    from numba import njit  # optional: nogil Text-mode parser, scales across threads
+except ImportError:
+    njit = None
+
 from .exceptions import OVF2Error
 from ..configs import OVF2_FIRST_LINE, \
-    HEADER_READ_BYTES, HEADER_DTYPES, HEADER_BEGIN_MARKER, HEADER_END_MARKER, \
+    HEADER_DTYPES, HEADER_BEGIN_MARKER, HEADER_END_MARKER, \
     DATA_BEGIN_MARKER, DATA_END_MARKER, \
     BINARY4_FLAG, BINARY8_FLAG
 
-def extract_metadata(content: bytes, fn: str) -> dict[str, int|float|str]:
+if njit is not None:
+    @njit(nogil=True, cache=True)
+    def _parse_floats_kernel(buf: np.ndarray, out: np.ndarray) -> int:  # pragma: no cover
+        """
+        Tokenize whitespace-separated decimal floats from a uint8 buffer into
+        `out` (float32). Returns the total token count, or -1 on a malformed
+        token. Releases the GIL, so Text-mode parsing scales across the
+        reader thread pool.
+        """
+        n = 0
+        i = 0
+        L = buf.shape[0]
+        while i < L:
+            c = buf[i]
+            if c == 32 or c == 9 or c == 10 or c == 13:  # whitespace
+                i += 1
+                continue
+            sign = 1.0
+            if c == 43 or c == 45:  # +/-
+                if c == 45:
+                    sign = -1.0
+                i += 1
+            mant = 0.0
+            ndig = 0
+            while i < L and 48 <= buf[i] <= 57:
+                mant = mant * 10.0 + (buf[i] - 48)
+                ndig += 1
+                i += 1
+            exp10 = 0
+            if i < L and buf[i] == 46:  # '.'
+                i += 1
+                while i < L and 48 <= buf[i] <= 57:
+                    mant = mant * 10.0 + (buf[i] - 48)
+                    ndig += 1
+                    exp10 -= 1
+                    i += 1
+            if ndig == 0:
+                return -1
+            if i < L and (buf[i] == 101 or buf[i] == 69):  # e/E
+                i += 1
+                esign = 1
+                if i < L and (buf[i] == 43 or buf[i] == 45):
+                    if buf[i] == 45:
+                        esign = -1
+                    i += 1
+                e = 0
+                edig = 0
+                while i < L and 48 <= buf[i] <= 57:
+                    e = e * 10 + (buf[i] - 48)
+                    edig += 1
+                    i += 1
+                if edig == 0:
+                    return -1
+                exp10 += esign * e
+            if i < L:
+                c = buf[i]
+                if not (c == 32 or c == 9 or c == 10 or c == 13):
+                    return -1  # token ran into a non-numeric character
+            if n < out.shape[0]:
+                out[n] = sign * mant * 10.0 ** exp10
+            n += 1
+        return n
+else:
+    _parse_floats_kernel = None
+
+# flag checks read the value in place; slicing the flag bytes out would
+# allocate a fresh bytes object per file
+_unpack_f4 = struct.Struct("<f").unpack_from
+_unpack_f8 = struct.Struct("<d").unpack_from
+_BINARY4_CHECK = _unpack_f4(BINARY4_FLAG)[0]
+_BINARY8_CHECK = _unpack_f8(BINARY8_FLAG)[0]
+
+# one "# key: value" header line; the greedy key group splits at the LAST colon,
+# matching the old rsplit(":", 1) semantics (e.g. "Desc: Total simulation time:  0  s")
+_HDR_RE = re.compile(rb"^#[ \t]*(.+):[ \t]*(.*?)[ \t\r]*$", re.MULTILINE)
+
+def extract_metadata(content: bytes | mmap.mmap, fn: str) -> dict[str, int|float|str]:
     start = content.find(HEADER_BEGIN_MARKER)
-    end = content.find(HEADER_END_MARKER)
+    end = content.find(HEADER_END_MARKER, start + len(HEADER_BEGIN_MARKER)) if start != -1 else -1
 
     if start == -1 or end == -1:
         raise OVF2Error(fn, "Header markers not found.")
 
-    header_bytes = content[start + len(HEADER_BEGIN_MARKER):end]
-    header_lines = header_bytes.decode().splitlines()
+    return _extract_metadata_from_slice(content, start + len(HEADER_BEGIN_MARKER), end)
 
+def _extract_metadata_from_slice(content: bytes | mmap.mmap, start: int, end: int) -> dict[str, int|float|str]:
+    """Parse header fields from content[start:end], the region between the header markers."""
     metadata = {}
-    for line in header_lines:
-        if ":" not in line:
-            continue
-        key, value = line.rsplit(":",1)
-        key = key.strip("# ")
-        value = value.strip()
+    # single C-level scan over the raw header bytes; decode per matched field only
+    for m in _HDR_RE.finditer(content, start, end):
+        key = m.group(1).decode().strip("# ")
+        value = m.group(2).decode()
         dtype = HEADER_DTYPES.get(key, str)
 
         if dtype is int:
@@ -31,36 +122,68 @@ def extract_metadata(content: bytes, fn: str) -> dict[str, int|float|str]:
             metadata[key] = float(value)
         else:  # str
             metadata[key] = value
-    
+
     return metadata
 
-def reorder_xyz(m_flat: np.ndarray, X: int, Y: int, Z: int) -> np.ndarray:
+def reorder_xyz(m_nat: np.ndarray) -> np.ndarray:
     """
     OVF increments x fastest, then y, then z.
 
     see https://math.nist.gov/oommf/doc/userguide20b0/userguide/Data_block.html
 
-    m_flat: (N,3) with N = X*Y*Z
-    -> return (X, Y, Z, 3)
+    m_nat: (Z, Y, X, 3), the natural file order
+    -> return (X, Y, Z, 3), C-contiguous
+
+    The transpose alone would be a strided view; downstream consumers
+    (notably HDF5 chunked writes) want contiguous bytes, so materialize
+    it as one contiguous copy here instead of per-element strided writes there.
     """
-    return np.transpose(m_flat.reshape(Z, Y, X, 3), (2, 1, 0, 3))
+    return np.ascontiguousarray(m_nat.transpose(2, 1, 0, 3))
 
-def extract_magnetic_data_from_text(content: bytes, fn: str) -> np.ndarray:
-    
-    start = content.find(DATA_BEGIN_MARKER)
-    end   = content.find(DATA_END_MARKER)
-    if start == -1 or end == -1 or end <= start:
-        raise OVF2Error(fn, "Data block not found.")
+def extract_magnetic_data_from_text(content: bytes | mmap.mmap, fn: str,
+                                    payload_start: int | None = None,
+                                    expected_count: int | None = None) -> np.ndarray:
+    # callers that already located the data marker pass payload_start to
+    # avoid rescanning the content from the top
+    if payload_start is None:
+        start = content.find(DATA_BEGIN_MARKER)
+        if start == -1:
+            raise OVF2Error(fn, "Data block not found.")
+        payload_start = content.find(b"\n", start) + 1
 
-    payload_start = content.find(b"\n", start) + 1
+    end = content.find(DATA_END_MARKER, payload_start)
+    if end == -1:
+        raise OVF2Error(fn, "Data block not found.")
 
     payload = content[payload_start:end]
 
-    m_flat = np.fromstring(payload.decode(), sep=" ", dtype=np.float32)
+    # fastest path: the nogil numba kernel writes straight into a pre-sized
+    # buffer when the caller knows how many values to expect
+    if _parse_floats_kernel is not None and expected_count is not None:
+        out = np.empty(expected_count, dtype=np.float32)
+        count = _parse_floats_kernel(np.frombuffer(payload, dtype=np.uint8), out)
+        if count == expected_count:
+            return out
+        # malformed or mismatched payload: fall through to the generic parser,
+        # which reproduces the exact value count for the caller's error message
+
+    # parse the raw bytes directly, avoiding a full unicode copy of the payload
+    if pd is not None:
+        try:
+            m_flat = pd.read_csv(
+                io.BytesIO(payload),
+                sep=r"\s+", header=None, dtype=np.float32,
+                engine="c", na_filter=False,
+            ).to_numpy().ravel()
+        except (ValueError, pd.errors.ParserError):
+            # ragged/malformed rows: tolerant flat parse, caller validates the count
+            m_flat = np.array(payload.split(), dtype=np.float32)
+    else:
+        m_flat = np.array(payload.split(), dtype=np.float32)
 
     return m_flat
 
-def read_ovf2(fn: str) -> tuple[dict[str, int|float|str], np.ndarray]:
+def read_ovf2(fn: str, natural_order: bool = False) -> tuple[dict[str, int|float|str], np.ndarray]:
     """
     Read an OVF 2.0 file produced by Mumax3 or OOMMF.
 
@@ -68,6 +191,10 @@ def read_ovf2(fn: str) -> tuple[dict[str, int|float|str], np.ndarray]:
     ----------
     fn : str
         Path to the OVF 2.0 file.
+    natural_order : bool, default=False
+        If True, return the magnetization in the file's natural (Z, Y, X, 3)
+        order instead of (X, Y, Z, 3). This skips the transpose copy entirely;
+        for Binary 4/8 the result is a zero-copy view over the file mapping.
 
     Returns
     -------
@@ -78,7 +205,8 @@ def read_ovf2(fn: str) -> tuple[dict[str, int|float|str], np.ndarray]:
         'znodes', 'xstepsize', 'ystepsize', 'zstepsize', 'meshunit', etc.
         Values are converted to the proper Python type (int, float, str).
     magnetization : np.ndarray
-        Magnetization field with shape (X, Y, Z, 3), where:
+        Magnetization field with shape (X, Y, Z, 3) — or (Z, Y, X, 3) when
+        `natural_order` is True — where:
           - X = xnodes
           - Y = ynodes
           - Z = znodes
@@ -88,22 +216,45 @@ def read_ovf2(fn: str) -> tuple[dict[str, int|float|str], np.ndarray]:
     -----
     - Only OVF 2.0 rectangular mesh files with valuedim=3 are supported.
     - Data mode may be Text, Binary 4, or Binary 8
-    - For Binary 4 or Binary 8, memmap (a subclass of np.ndarray) is returned (efficient)
-    - For Text, np.array is returned but require full file reading (not efficient)
+    - For Binary 4 or Binary 8, the payload is read through a read-only mmap
+      and reordered into a contiguous array in one copy (efficient)
+    - For Text, np.array is returned but require full payload parsing (not efficient)
     """
 
-    with open(fn, "rb") as f:
-        head = f.read(HEADER_READ_BYTES)
+    # mmap the whole file: header parsing only pages in the first few kB,
+    # and the binary branches reuse the same mapping for the data view
+    fd = os.open(fn, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            raise OVF2Error(
+                fn,
+                f"Invalid OVF2 header. Expected first line {OVF2_FIRST_LINE!r}, "
+                f"First line was: '<empty file>'"
+            )
+        head = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
 
-    if not head.startswith(OVF2_FIRST_LINE):
-        first_line = head.splitlines()[0].decode(errors="replace") if head else "<empty file>"
+    if head[:len(OVF2_FIRST_LINE)] != OVF2_FIRST_LINE:
+        nl = head.find(b"\n")
+        first_line = head[:nl if nl != -1 else len(head)].decode(errors="replace")
         raise OVF2Error(
             fn,
             f"Invalid OVF2 header. Expected first line {OVF2_FIRST_LINE!r}, "
             f"First line was: {first_line!r}"
         )
 
-    metadata = extract_metadata(head, fn)
+    # locate all markers in one forward pass: each find resumes where the
+    # previous marker ended instead of rescanning the file from the start
+    header_start = head.find(HEADER_BEGIN_MARKER)
+    header_end = head.find(HEADER_END_MARKER, header_start + len(HEADER_BEGIN_MARKER)) \
+        if header_start != -1 else -1
+    if header_start == -1 or header_end == -1:
+        raise OVF2Error(fn, "Header markers not found.")
+
+    metadata = _extract_metadata_from_slice(
+        head, header_start + len(HEADER_BEGIN_MARKER), header_end
+    )
 
     mesh_type = metadata.get("meshtype", "")
     if mesh_type.lower() != "rectangular":
@@ -122,7 +273,7 @@ def read_ovf2(fn: str) -> tuple[dict[str, int|float|str], np.ndarray]:
     X, Y, Z = metadata["xnodes"], metadata["ynodes"], metadata["znodes"]
     N = X * Y * Z
 
-    data_marker_start = head.find(DATA_BEGIN_MARKER)
+    data_marker_start = head.find(DATA_BEGIN_MARKER, header_end + len(HEADER_END_MARKER))
     if data_marker_start == -1:
         raise OVF2Error(fn, "Data block not found.")
 
@@ -134,35 +285,43 @@ def read_ovf2(fn: str) -> tuple[dict[str, int|float|str], np.ndarray]:
 
     # for Binary 4 and Binary 8, return view from memmap, efficient
     if mode == b"Binary 4":
-        flag = head[payload_start:payload_start+4]
-        if flag != BINARY4_FLAG:
+        try:
+            flag_ok = _unpack_f4(head, payload_start)[0] == _BINARY4_CHECK
+        except struct.error:  # truncated payload
+            flag_ok = False
+        if not flag_ok:
             raise OVF2Error(
                 fn,
-                f"Binary4 flag mismatch. Expected {BINARY4_FLAG}, got {flag}"
+                f"Binary4 flag mismatch. Expected {BINARY4_FLAG}, "
+                f"got {head[payload_start:payload_start+4]}"
             )
         offset, dtype = payload_start + 4, "<f4"
 
     elif mode == b"Binary 8":
-        flag = head[payload_start:payload_start+8]
-        if flag != BINARY8_FLAG:
+        try:
+            flag_ok = _unpack_f8(head, payload_start)[0] == _BINARY8_CHECK
+        except struct.error:  # truncated payload
+            flag_ok = False
+        if not flag_ok:
             raise OVF2Error(
                 fn,
-                f"Binary8 flag mismatch. Expected {BINARY8_FLAG}, got {flag}"
+                f"Binary8 flag mismatch. Expected {BINARY8_FLAG}, "
+                f"got {head[payload_start:payload_start+8]}"
             )
         offset, dtype = payload_start + 8, "<f8"
 
-    # for Text, require full file read, not efficient
+    # for Text, require full payload parsing, not efficient
     elif mode == b"Text":
-        with open(fn, 'rb') as f:
-            full_content = f.read()
-        m_flat = extract_magnetic_data_from_text(full_content, fn)
+        m_flat = extract_magnetic_data_from_text(head, fn, payload_start=payload_start,
+                                                 expected_count=3 * N)
         if len(m_flat) != 3 * N:
             raise OVF2Error(
                 fn,
                 f"Node count mismatch. Expected xnodes*ynodes*znodes={3 * N}, "
                 f"but data contained {len(m_flat)} values"
             )
-        magnetization = reorder_xyz(m_flat, X, Y, Z)
+        m_nat = m_flat.reshape(Z, Y, X, 3)
+        magnetization = m_nat if natural_order else reorder_xyz(m_nat)
         return metadata, magnetization
     else:
         raise OVF2Error(
@@ -171,7 +330,7 @@ def read_ovf2(fn: str) -> tuple[dict[str, int|float|str], np.ndarray]:
             f"but got {mode!r}"
         )
 
-    mm = np.memmap(fn, mode="r", dtype=dtype, offset=offset, shape=3 * N)
-    magnetization = reorder_xyz(mm, X, Y, Z)
-    
+    m_nat = np.frombuffer(head, dtype=dtype, count=3 * N, offset=offset).reshape(Z, Y, X, 3)
+    magnetization = m_nat if natural_order else reorder_xyz(m_nat)
+
     return metadata, magnetization
\ No newline at end of file
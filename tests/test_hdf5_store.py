@@ -0,0 +1,160 @@
+import os
+import shutil
+
+import h5py
+import numpy as np
+import pytest
+from pathlib import Path
+
+from mumax_oommf_tools import read_ovf2, read_simulation_result
+from mumax_oommf_tools.io.hdf5_store import build_h5_from_ovfs
+from mumax_oommf_tools.configs import DEFAULT_H5NAME, FINGERPRINT_ATTRKEY
+import mumax_oommf_tools.io.ovf2_reader as ovf2_reader
+
+TINY_DIR = Path(__file__).parent / "data" / "tiny_ovfs"
+OUT_DIR = Path(__file__).parent / "data" / "test.out"
+
+OVF_NAMES = sorted(p.name for p in OUT_DIR.glob("*.ovf"))
+
+
+def _copy_ovfs(dst: Path, names):
+    for n in names:
+        shutil.copy(OUT_DIR / n, dst)
+
+
+def _expected_tiny():
+    # Expected values in (X, Y, Z, 3) order: (i+1, j+1, k+1)
+    expected = np.zeros((2, 2, 2, 3), dtype=float)
+    for i in range(2):
+        for j in range(2):
+            for k in range(2):
+                expected[i, j, k] = (i + 1, j + 1, k + 1)
+    return expected
+
+
+@pytest.mark.parametrize("fname", ["text.ovf", "binary4.ovf", "binary8.ovf"])
+def test_natural_order_shape_and_values(fname):
+    meta, nat = read_ovf2(TINY_DIR / fname, natural_order=True)
+
+    assert nat.shape == (2, 2, 2, 3)  # (Z, Y, X, 3)
+    assert np.allclose(nat.transpose(2, 1, 0, 3), _expected_tiny(), rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.skipif(ovf2_reader._parse_floats_kernel is None, reason="numba not installed")
+def test_text_mode_numba_kernel():
+    # with numba present the kernel is the default Text-mode path
+    _, arr = read_ovf2(TINY_DIR / "text.ovf")
+    assert np.allclose(arr, _expected_tiny(), rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.skipif(ovf2_reader.pd is None, reason="pandas not installed")
+def test_text_mode_pandas_parser(monkeypatch):
+    monkeypatch.setattr(ovf2_reader, "_parse_floats_kernel", None)
+    _, arr = read_ovf2(TINY_DIR / "text.ovf")
+    assert np.allclose(arr, _expected_tiny(), rtol=1e-6, atol=1e-6)
+
+
+def test_text_mode_flat_fallback(monkeypatch):
+    monkeypatch.setattr(ovf2_reader, "_parse_floats_kernel", None)
+    monkeypatch.setattr(ovf2_reader, "pd", None)
+    _, arr = read_ovf2(TINY_DIR / "text.ovf")
+    assert np.allclose(arr, _expected_tiny(), rtol=1e-6, atol=1e-6)
+
+
+def test_append_then_read_roundtrip(tmp_path):
+    # build from a prefix of the frames, then add the rest and append
+    _copy_ovfs(tmp_path, OVF_NAMES[:4])
+    build_h5_from_ovfs(tmp_path)
+    _copy_ovfs(tmp_path, OVF_NAMES[4:])
+    meta, time, mag = read_simulation_result(tmp_path)
+
+    # must match a from-scratch build of the full folder
+    full = tmp_path / "full"
+    full.mkdir()
+    _copy_ovfs(full, OVF_NAMES)
+    _, time_full, mag_full = read_simulation_result(full)
+
+    assert np.array_equal(time, time_full)
+    assert np.array_equal(mag, mag_full)
+
+
+def test_prepended_file_triggers_realignment(tmp_path):
+    # a new file sorting before the ingested ones shifts every index; the
+    # cache must be rebuilt, not blindly appended to
+    _copy_ovfs(tmp_path, OVF_NAMES[1:])
+    build_h5_from_ovfs(tmp_path)
+    _copy_ovfs(tmp_path, OVF_NAMES[:1])
+    meta, time, mag = read_simulation_result(tmp_path)
+
+    full = tmp_path / "full"
+    full.mkdir()
+    _copy_ovfs(full, OVF_NAMES)
+    _, time_full, mag_full = read_simulation_result(full)
+
+    assert np.array_equal(time, time_full)
+    assert np.array_equal(mag, mag_full)
+
+
+def test_fast_skip_hit_and_miss(tmp_path):
+    _copy_ovfs(tmp_path, OVF_NAMES)
+    read_simulation_result(tmp_path)
+    h5_path = tmp_path / DEFAULT_H5NAME
+
+    # hit: a second read must not touch the cache file at all
+    mtime = h5_path.stat().st_mtime_ns
+    read_simulation_result(tmp_path)
+    assert h5_path.stat().st_mtime_ns == mtime
+
+    # miss: replacing an already-ingested OVF must refresh that frame's data,
+    # not just the fingerprint
+    with h5py.File(h5_path) as f:
+        fp_before = f.attrs[FINGERPRINT_ATTRKEY]
+    shutil.copy(OUT_DIR / OVF_NAMES[2], tmp_path / OVF_NAMES[5])
+    _, _, mag = read_simulation_result(tmp_path)
+    with h5py.File(h5_path) as f:
+        fp_after = f.attrs[FINGERPRINT_ATTRKEY]
+    assert fp_before != fp_after
+    assert np.array_equal(mag[5], mag[2])
+
+
+def test_append_respects_existing_compression(tmp_path):
+    # append with compression=None into a gzip'd cache must keep frames readable
+    _copy_ovfs(tmp_path, OVF_NAMES[:-1])
+    build_h5_from_ovfs(tmp_path, compression="gzip")
+    _copy_ovfs(tmp_path, OVF_NAMES[-1:])
+    build_h5_from_ovfs(tmp_path, compression=None)
+
+    with h5py.File(tmp_path / DEFAULT_H5NAME) as f:
+        appended = f["magnetization"][-1]
+
+    _, expected = read_ovf2(tmp_path / OVF_NAMES[-1], natural_order=True)
+    assert np.array_equal(appended, expected)
+
+
+def test_bitshuffle_roundtrip(tmp_path):
+    pytest.importorskip("hdf5plugin")
+    # build with bitshuffle, then append with the default compression=None;
+    # every frame must survive the filtered write path and read back exactly
+    _copy_ovfs(tmp_path, OVF_NAMES[:-1])
+    build_h5_from_ovfs(tmp_path, compression="bitshuffle")
+    _copy_ovfs(tmp_path, OVF_NAMES[-1:])
+    build_h5_from_ovfs(tmp_path)
+
+    with h5py.File(tmp_path / DEFAULT_H5NAME) as f:
+        mag = f["magnetization"][...]
+
+    for i, n in enumerate(OVF_NAMES):
+        _, expected = read_ovf2(tmp_path / n, natural_order=True)
+        assert np.array_equal(mag[i], expected)
+
+
+def test_read_cache_without_ovfs(tmp_path):
+    # keeping only the HDF5 cache and deleting the raw OVFs stays supported
+    _copy_ovfs(tmp_path, OVF_NAMES)
+    _, time, mag = read_simulation_result(tmp_path)
+    for n in OVF_NAMES:
+        os.remove(tmp_path / n)
+
+    _, time_cached, mag_cached = read_simulation_result(tmp_path)
+    assert np.array_equal(time_cached, time)
+    assert np.array_equal(mag_cached, mag)